@@ -25,7 +25,7 @@ URL = "https://github.com/stellargraph/stellargraph"
 tensorflow = "tensorflow-cpu" if "READTHEDOCS" in os.environ else "tensorflow"
 REQUIRES = [
     f"{tensorflow}>=2.0.0",
-    "numpy>=1.14",
+    "numpy>=1.17",
     "scipy>=1.1.0",
     "networkx>=2.2",
     "scikit_learn>=0.20",
@@ -18,11 +18,195 @@
 __all__ = ["UnsupervisedSampler"]
 
 
-import random
+import collections
+import itertools
+import multiprocessing
+import queue
+import threading
+
+import numpy as np
 
 from stellargraph.core.utils import is_real_iterable
 from stellargraph.core.graph import StellarGraph
-from stellargraph.data.explorer import UniformRandomWalk
+
+
+def _uniform_walks(indptr, indices, starts, length, seed):
+    """
+    Performs one uniform random walk from each of the root nodes, on a graph given as a
+    compressed sparse row (CSR) adjacency list: the neighbours of the node with index ``i``
+    are ``indices[indptr[i]:indptr[i + 1]]``.
+
+    All the walks are advanced together, one step at a time, so each step is a handful of
+    array operations rather than a Python loop over the walks.
+
+    Args:
+        indptr (numpy array): The offsets of each node's neighbours in ``indices``.
+        indices (numpy array): The indices of the neighbours of all the nodes.
+        starts (numpy array): The indices of the root nodes.
+        length (int): The length of the walks.
+        seed: The seed for the numpy random generator used for the walks.
+
+    Returns:
+        A numpy array with shape ``(len(starts), length)`` with the node indices of one walk
+        in each row. A walk stops at a node with no neighbours, and the rest of its row is -1.
+    """
+    rng = np.random.default_rng(seed)
+    steps = rng.random((len(starts), length - 1))
+
+    walks = np.full((len(starts), length), -1, dtype=indices.dtype)
+    walks[:, 0] = starts
+
+    # the walks that have not reached a dead end, and the node each of them is at
+    walking = np.arange(len(starts))
+    current = walks[:, 0]
+
+    for step in range(length - 1):
+        offsets = indptr[current]
+        degrees = indptr[current + 1] - offsets
+
+        has_neighbours = degrees > 0
+        walking = walking[has_neighbours]
+        offsets = offsets[has_neighbours]
+        degrees = degrees[has_neighbours]
+
+        # pick a neighbour of each current node, uniformly at random
+        choices = (steps[walking, step] * degrees).astype(indptr.dtype)
+        current = indices[offsets + choices]
+        walks[walking, step + 1] = current
+
+    return walks
+
+
+def _alias_table(weights):
+    """
+    Builds the tables for drawing samples from a discrete distribution in constant time with
+    Walker's alias method, using Vose's algorithm on integer weights. With integer weights, the
+    tables are built with exact arithmetic and a sample is drawn without any floating point.
+
+    A sample is drawn by picking an index ``i`` uniformly at random, and keeping it if a
+    uniformly random integer in ``[0, weights.sum())`` is less than ``thresholds[i]``, or
+    otherwise replacing it with ``aliases[i]``.
+
+    Args:
+        weights (numpy array): The non-negative integer weights of the outcomes, not all zero.
+
+    Returns:
+        A tuple of a numpy array of the threshold for keeping each index, and a numpy array of
+        the alias of each index.
+    """
+    n = len(weights)
+    total = int(weights.sum())
+
+    # each index has a column of height ``total``, and the outcomes are spread over them
+    scaled = [int(w) * n for w in weights]
+
+    thresholds = np.full(n, total, dtype=np.int64)
+    aliases = np.arange(n)
+
+    small = [i for i, w in enumerate(scaled) if w < total]
+    large = [i for i, w in enumerate(scaled) if w >= total]
+
+    while small and large:
+        less = small.pop()
+        more = large.pop()
+
+        thresholds[less] = scaled[less]
+        aliases[less] = more
+
+        # the outcome with the larger weight gives up some of its weight to fill the column
+        # of the smaller one
+        scaled[more] -= total - scaled[less]
+        if scaled[more] < total:
+            small.append(more)
+        else:
+            large.append(more)
+
+    # any outcomes left over fill their own columns exactly, so keep their defaults
+    return thresholds, aliases
+
+
+def _prefetch(iterator, size):
+    """
+    Yields the items of an iterator, which are produced ahead of time by a background thread
+    and held in a queue of at most ``size`` items. Most of the work of producing the batches of
+    samples is done by numpy, which releases the GIL, so this overlaps with the consumer.
+
+    The background thread stops when the returned generator is closed or garbage collected.
+    Any exception raised by the iterator is re-raised to the consumer, and the consumer is
+    always sent a final item when the background thread finishes, so it is never left waiting.
+
+    Args:
+        iterator: The iterator to consume in the background thread.
+        size (int): The maximum number of items produced ahead of the consumer.
+    """
+    items = queue.Queue(maxsize=size)
+    stop = threading.Event()
+
+    def put(item):
+        # wait for space in the queue, unless the consumer has gone away
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        # the end of the items, or the exception that stopped them
+        end = None
+        try:
+            for item in iterator:
+                if not put((True, item)):
+                    break
+        except BaseException as e:
+            end = e
+        finally:
+            try:
+                close = getattr(iterator, "close", None)
+                if close is not None:
+                    close()
+            finally:
+                put((False, end))
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+
+    try:
+        while True:
+            is_item, item = items.get()
+            if is_item:
+                yield item
+            elif item is None:
+                return
+            else:
+                raise item
+    finally:
+        stop.set()
+
+
+# The number of root nodes walked in each chunk. This is independent of the batch size, so that
+# each chunk is large enough for the vectorised walks, and for sending it to a worker process,
+# to be worthwhile.
+_WALK_CHUNK_SIZE = 1000
+
+# The number of chunks of walks in flight for each worker process when walks are generated with
+# multiple jobs
+_CHUNKS_PER_JOB = 2
+
+# The CSR adjacency list used by each worker process when walks are generated with multiple jobs
+_worker_indptr = None
+_worker_indices = None
+
+
+def _init_walk_worker(indptr, indices):
+    global _worker_indptr, _worker_indices
+    _worker_indptr = indptr
+    _worker_indices = indices
+
+
+def _walk_worker(args):
+    return _uniform_walks(_worker_indptr, _worker_indices, *args)
 
 
 class UnsupervisedSampler:
@@ -42,9 +226,25 @@ class UnsupervisedSampler:
                 If not provided, all nodes in the graph are used.
             length (int): An integer giving the length of the walks. Length must be at least 2.
             number_of_walks (int): Number of walks from each root node.
+            seed (int, optional): Random seed; if not provided the samples are not reproducible.
+            n_jobs (int): The number of worker processes used to generate the random walks.
+                If 1 (the default), the walks are generated in the current process.
+            prefetch (int): The number of batches to generate ahead of time in a background
+                thread, so that they are ready while the previous batches are being used, such
+                as when training with Keras. If 0 (the default), each batch is generated when
+                it is requested.
     """
 
-    def __init__(self, G, nodes=None, length=2, number_of_walks=1, seed=None):
+    def __init__(
+        self,
+        G,
+        nodes=None,
+        length=2,
+        number_of_walks=1,
+        seed=None,
+        n_jobs=1,
+        prefetch=0,
+    ):
         if not isinstance(G, StellarGraph):
             raise ValueError(
                 "({}) Graph must be a StellarGraph or StellarDigraph object.".format(
@@ -54,25 +254,6 @@ class UnsupervisedSampler:
         else:
             self.graph = G
 
-        # Instantiate the walker class used to generate random walks in the graph
-        self.walker = UniformRandomWalk(G, seed=seed)
-
-        # This code will enable alternative walker classes
-        # TODO: Enable this code, but figure out how to pass required options to run
-        # if walker is not None:
-        #     if not isinstance(
-        #         walker, UniformRandomWalk
-        #     ):  # only work with Uniform Random Walker at the moment
-        #         raise TypeError(
-        #             "({}) Only Uniform Random Walks are possible".format(
-        #                 type(self).__name__
-        #             )
-        #         )
-        #     else:
-        #         self.walker = walker(G, seed=seed)
-        # else:
-        #         self.walker = UniformRandomWalk(G, seed=seed)
-
         # Define the root nodes for the walks
         # if no root nodes are provided for sampling defaulting to using all nodes as root nodes.
         if nodes is None:
@@ -101,14 +282,49 @@ class UnsupervisedSampler:
         else:
             self.number_of_walks = number_of_walks
 
-        # Setup an interal random state with the given seed
-        self.random = random.Random(seed)
+        if type(n_jobs) != int or n_jobs < 1:
+            raise ValueError(
+                "({}) The number of jobs, n_jobs, must be a positive integer".format(
+                    type(self).__name__
+                )
+            )
+        else:
+            self.n_jobs = n_jobs
+
+        if type(prefetch) != int or prefetch < 0:
+            raise ValueError(
+                "({}) The number of batches to prefetch must be a non-negative integer".format(
+                    type(self).__name__
+                )
+            )
+        else:
+            self.prefetch = prefetch
+
+        # All the numpy random states are derived from a single seed sequence: the one used
+        # for the negative sampling, the one used to shuffle the root nodes, and an independent
+        # child state for each chunk of walks
+        self._seed_sequence = np.random.SeedSequence(seed)
+        sampling_seed, roots_seed = self._seed_sequence.spawn(2)
+        self._np_random = np.random.default_rng(sampling_seed)
+        self._roots_random = np.random.default_rng(roots_seed)
+
+        # The adjacency list used for the walks and the negative sampling distribution do not
+        # change between batches or epochs, so compute them once up front
+        self._compute_graph_arrays()
+
+        # The root nodes are looked up by index when walking, so check that they are all in
+        # the graph
+        for node in self.nodes:
+            if node not in self._node_index:
+                raise ValueError(
+                    "({}) node {} not in graph".format(type(self).__name__, node)
+                )
 
     def generator(self, batch_size):
 
         """
         This method yields a batch_size number of positive and negative samples from the graph.
-        This method generates one walk at a time of a given length from each root node and returns
+        This method generates walks of a given length from each root node and returns
         the positive pairs from the walks and the same number of negative pairs from a global
         node sampling distribution.
 
@@ -121,69 +337,216 @@ class UnsupervisedSampler:
                 This must be an even number.
 
         Returns:
-            Tuple of lists of target/context pairs and labels – 0 for a negative and 1 for a
-             positive pair: ([[target, context] ,... ], [label, ...])
+            Tuple of a numpy array of target/context pairs with shape ``(batch_size, 2)`` and
+            a numpy array of labels – 0 for a negative and 1 for a positive pair:
+            ([[target, context] ,... ], [label, ...]). The pairs are an ``int64`` array if
+            every node ID in the graph is an integer, and an object array otherwise.
         """
         self._check_parameter_values(batch_size)
 
-        positive_pairs = list()
-        negative_pairs = list()
+        # generate the batches in a background thread, if requested
+        batches = self._batches(batch_size)
+        if self.prefetch > 0:
+            batches = _prefetch(batches, self.prefetch)
+
+        yield from batches
+
+    def _batches(self, batch_size):
+        """
+        Yields the batches of samples for ``generator``, in the current thread.
 
+        Args:
+             batch_size (int): The number of samples to generate for each batch.
+        """
+        half_batch_size = batch_size // 2
+
+        # The (target, context) pairs of the current batch, written directly into one array of
+        # node indices: the first half of the rows holds the positive pairs and the second half
+        # the matching negative pairs. The indices are only mapped to node IDs when the batch
+        # is yielded.
+        pairs = np.empty((batch_size, 2), dtype=self._indices.dtype)
         sample_counter = 0
 
-        all_nodes = list(self.graph.nodes())
-
-        # Use the sampling distribution as per node2vec
-        degrees = self.graph.node_degrees()
-        sampling_distribution = [degrees[n] ** 0.75 for n in all_nodes]
-
-        done = False
-        while not done:
-            self.random.shuffle(self.nodes)
-            for node in self.nodes:  # iterate over root nodes
-                # Get 1 walk at a time. For now its assumed that its a uniform random walker
-                walk = self.walker.run(
-                    nodes=[node],  # root nodes
-                    length=self.length,  # maximum length of a random walk
-                    n=1,  # number of random walks per root node
+        # The labels are only 0 or 1, so they are stored as bytes; Keras casts them as needed.
+        labels = np.empty(batch_size, dtype=np.int8)
+        labels[:half_batch_size] = 1
+        labels[half_batch_size:] = 0
+
+        node_array = self._node_array
+        alias_thresholds = self._alias_thresholds
+        aliases = self._aliases
+        alias_total = self._alias_total
+
+        # Each pass over the root nodes is split into chunks of walks, so that walks can be
+        # generated in parallel and the first batches are available without waiting for the
+        # whole pass
+        for walks in self._walks():
+            # (target,contect) pair sampling - GraphSAGE way. Each walk is a row of node
+            # indices, padded with -1 after a dead end, and self pairs are not added.
+            walk_targets = walks[:, :1]
+            walk_contexts = walks[:, 1:]
+            is_pair = (walk_contexts >= 0) & (walk_contexts != walk_targets)
+
+            chunk_targets = np.broadcast_to(walk_targets, walk_contexts.shape)[is_pair]
+            chunk_contexts = walk_contexts[is_pair]
+
+            # For each positive sample, add a negative sample. All the negative samples for
+            # the chunk are drawn at once, with two lookups in the alias table each.
+            n_samples = len(chunk_contexts)
+            candidates = self._np_random.integers(len(node_array), size=n_samples)
+            chunk_negatives = np.where(
+                self._np_random.integers(alias_total, size=n_samples)
+                < alias_thresholds[candidates],
+                candidates,
+                aliases[candidates],
+            )
+
+            start = 0
+            while start < n_samples:
+                # copy as many of the chunk's samples as fit into the current batch
+                count = min(half_batch_size - sample_counter, n_samples - start)
+                chunk_slice = slice(start, start + count)
+                positive_slice = slice(sample_counter, sample_counter + count)
+                negative_slice = slice(
+                    half_batch_size + sample_counter,
+                    half_batch_size + sample_counter + count,
+                )
+
+                pairs[positive_slice, 0] = chunk_targets[chunk_slice]
+                pairs[positive_slice, 1] = chunk_contexts[chunk_slice]
+                pairs[negative_slice, 0] = chunk_targets[chunk_slice]
+                pairs[negative_slice, 1] = chunk_negatives[chunk_slice]
+
+                start += count
+                sample_counter += count
+
+                # If the batch_size number of samples are accumulated, yield.
+                if sample_counter == half_batch_size:
+                    sample_counter = 0
+
+                    # indexing with the permutation copies the pairs, so the array can be
+                    # reused for the next batch
+                    perm = self._np_random.permutation(batch_size)
+                    yield node_array[pairs[perm]], labels[perm]
+
+    def _walks(self, chunk_size=_WALK_CHUNK_SIZE):
+        """
+        Yields the walks from a chunk of root nodes at a time, in repeated passes over the
+        shuffled root nodes. The chunks of each pass are distributed over ``n_jobs`` worker
+        processes if there is more than one job, with only a few chunks per worker in flight at
+        a time, so that the workers do not walk far ahead of the consumer.
+
+        The walks of each chunk are yielded as a single array of node indices with one walk
+        per row, as returned by ``_uniform_walks``.
+
+        Args:
+            chunk_size (int): The number of root nodes in each chunk.
+        """
+        node_index = self._node_index
+
+        if self.n_jobs > 1:
+            pool = multiprocessing.Pool(
+                self.n_jobs,
+                initializer=_init_walk_worker,
+                initargs=(self._indptr, self._indices),
+            )
+
+            def map_walks(tasks):
+                pending = collections.deque()
+                for task in tasks:
+                    pending.append(pool.apply_async(_walk_worker, (task,)))
+                    if len(pending) >= _CHUNKS_PER_JOB * self.n_jobs:
+                        yield pending.popleft().get()
+
+        else:
+            pool = None
+
+            def map_walks(tasks):
+                return (
+                    _uniform_walks(self._indptr, self._indices, *task) for task in tasks
                 )
 
-                # (target,contect) pair sampling - GraphSAGE way
-                target = walk[0][0]
-                context_window = walk[0][1:]
-                for context in context_window:
-                    # Don't add self pairs
-                    if context == target:
-                        continue
-
-                    positive_pairs.append((target, context))
-                    sample_counter += 1
-
-                    # For each positive sample, add a negative sample.
-                    random_sample = self.random.choices(
-                        all_nodes, weights=sampling_distribution, k=1
-                    )
-                    negative_pairs.append((target, *random_sample))
-                    sample_counter += 1
-
-                    # If the batch_size number of samples are accumulated, yield.
-                    if sample_counter == batch_size:
-                        all_pairs = positive_pairs + negative_pairs
-                        all_targets = [1] * len(positive_pairs) + [0] * len(
-                            negative_pairs
-                        )
-
-                        positive_pairs.clear()
-                        negative_pairs.clear()
-                        sample_counter = 0
-
-                        edge_ids_labels = list(zip(all_pairs, all_targets))
-                        self.random.shuffle(edge_ids_labels)
-                        edge_ids, edge_labels = [
-                            [z[i] for z in edge_ids_labels] for i in (0, 1)
-                        ]
-
-                        yield edge_ids, edge_labels
+        # The indices of the root nodes are looked up once, and each pass shuffles this integer
+        # array rather than the list of nodes
+        all_roots = np.array(
+            [node_index[n] for n in self.nodes], dtype=self._indices.dtype
+        )
+
+        def tasks():
+            while True:
+                roots = self._roots_random.permutation(all_roots)
+
+                # Every chunk of root nodes gets its own independent random state, spawned from
+                # the sampler's seed sequence, so that the walks do not depend on the number of
+                # jobs or on which worker walks each chunk
+                starts = range(0, len(roots), chunk_size)
+                chunk_seeds = self._seed_sequence.spawn(len(starts))
+                for start, chunk_seed in zip(starts, chunk_seeds):
+                    yield roots[start : start + chunk_size], self.length, chunk_seed
+
+        try:
+            yield from map_walks(tasks())
+        finally:
+            if pool is not None:
+                pool.terminate()
+
+    def _compute_graph_arrays(self):
+        """
+        Computes the array of nodes in the graph, the adjacency list of the graph in compressed
+        sparse row (CSR) form used for the walks, and the alias table used to draw negative
+        samples from the nodes, and caches these on the sampler.
+        """
+        nodes = list(self.graph.nodes())
+        self._node_index = {node: i for i, node in enumerate(nodes)}
+
+        # The node IDs are kept in an array, so that the nodes of many indices can be looked up
+        # with a single fancy index. If the node IDs are all integers, the batches of pairs are
+        # then contiguous integer arrays, as long as they fit in an int64 (hashed IDs may not).
+        # Otherwise, node IDs may be tuples, so the object array is filled one element at a time
+        # rather than letting numpy treat them as sequences.
+        int64_info = np.iinfo(np.int64)
+        if all(
+            isinstance(node, (int, np.integer))
+            and not isinstance(node, bool)
+            and int64_info.min <= int(node) <= int64_info.max
+            for node in nodes
+        ):
+            self._node_array = np.array(nodes, dtype=np.int64)
+        else:
+            self._node_array = np.empty(len(nodes), dtype=object)
+            for i, node in enumerate(nodes):
+                self._node_array[i] = node
+
+        # The neighbours are listed in the same way as for UniformRandomWalk, with one entry
+        # per edge. Each node's neighbours are sorted by index, so that the steps of the walks
+        # read the indices array in order as much as possible.
+        neighbours = [
+            sorted(self._node_index[n] for n in self.graph.neighbors(node))
+            for node in nodes
+        ]
+        self._indptr = np.zeros(len(neighbours) + 1, dtype=np.int64)
+        np.cumsum([len(ns) for ns in neighbours], out=self._indptr[1:])
+        self._indices = np.fromiter(
+            itertools.chain.from_iterable(neighbours),
+            dtype=np.int32,
+            count=self._indptr[-1],
+        )
+
+        # The degree of each node is its number of neighbours in the adjacency list, except
+        # that an undirected self loop is listed once but counts twice, as in node_degrees
+        self._degrees = np.diff(self._indptr)
+        if not self.graph.is_directed():
+            rows = np.repeat(np.arange(len(nodes)), self._degrees)
+            self._degrees += np.bincount(
+                rows[self._indices == rows], minlength=len(nodes)
+            )
+
+        # Use the sampling distribution as per node2vec. The weights are quantized to integers
+        # with 20 fractional bits, which keeps every node with an edge at a non-zero weight.
+        self._weights = self._degrees.astype(np.float32) ** 0.75
+        quantized_weights = np.rint(self._weights * (1 << 20)).astype(np.int64)
+        self._alias_thresholds, self._aliases = _alias_table(quantized_weights)
+        self._alias_total = int(quantized_weights.sum())
 
     def _check_parameter_values(self, batch_size):
         """
@@ -14,12 +14,25 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import threading
+
+import networkx as nx
+import numpy as np
 import pytest
 
-from stellargraph.data.unsupervised_sampler import UnsupervisedSampler
+from stellargraph.data.unsupervised_sampler import (
+    UnsupervisedSampler,
+    _alias_table,
+    _prefetch,
+    _uniform_walks,
+)
 from stellargraph.core.graph import StellarGraph
 
-from ..test_utils.graphs import example_graph_2, create_test_graph_nx
+from ..test_utils.graphs import (
+    example_graph_2,
+    example_graph_random,
+    create_test_graph_nx,
+)
 
 
 class TestUnsupervisedSampler(object):
@@ -65,21 +78,17 @@ class TestUnsupervisedSampler(object):
         sampler = UnsupervisedSampler(G=g, nodes=None)
         assert sampler.nodes == list(g.nodes())
 
+        # the root nodes must all be in the graph
+        with pytest.raises(ValueError, match="not in graph"):
+            UnsupervisedSampler(G=g, nodes=["0", "not a node"])
+
         # if the seed value is provided check
-        # that the random choices is reproducable
-        sampler = UnsupervisedSampler(G=g, seed=1)
-        assert sampler.random.choices(range(100), k=10) == [
-            13,
-            84,
-            76,
-            25,
-            49,
-            44,
-            65,
-            78,
-            9,
-            2,
-        ]
+        # that the samples are reproducable
+        def batches(seed):
+            sample_gen = UnsupervisedSampler(G=g, length=3, seed=seed).generator(4)
+            return [next(sample_gen)[0].tolist() for _ in range(5)]
+
+        assert batches(1) == batches(1)
 
     def test_generator_parameter(self):
 
@@ -128,6 +137,16 @@ class TestUnsupervisedSampler(object):
         # batch-size number of samples are returned if batch_size is even
         assert len(samples[0]) == batch_size
 
+        # the (target, context) pairs are returned as the rows of an array
+        assert samples[0].shape == (batch_size, 2)
+
+        # the node IDs of this graph are integers, so the pairs are an integer array
+        assert samples[0].dtype == np.int64
+
+        # the labels are a compact array of 0s and 1s
+        assert samples[1].dtype == np.int8
+        assert sorted(samples[1].tolist()) == [0, 0, 1, 1]
+
     def test_generator_multiple_batches(self):
 
         n_feat = 4
@@ -145,3 +164,213 @@ class TestUnsupervisedSampler(object):
             batches.append(next(sample_gen))
 
         assert len(batches) == number_of_batches
+
+    def test_generator_negative_samples(self):
+
+        batch_size = 10
+        number_of_batches = 20
+
+        G = example_graph_random(feature_size=None, n_nodes=10, n_isolates=4)
+        degrees = G.node_degrees()
+
+        sampler = UnsupervisedSampler(G=G, length=3, seed=1)
+        sample_gen = sampler.generator(batch_size)
+
+        for _ in range(number_of_batches):
+            pairs, labels = next(sample_gen)
+
+            # equal number of positive and negative samples in each batch
+            assert sum(labels) == batch_size // 2
+
+            # negative samples are drawn with probability proportional to degree ** 0.75,
+            # so nodes without edges can never be sampled
+            for (target, context), label in zip(pairs, labels):
+                if label == 0:
+                    assert degrees[context] > 0
+
+    def test_generator_n_jobs(self):
+
+        batch_size = 4
+        number_of_batches = 10
+
+        G = example_graph_random(feature_size=None, n_nodes=20, n_isolates=2)
+
+        # the number of jobs must be a positive integer
+        with pytest.raises(ValueError):
+            UnsupervisedSampler(G=G, n_jobs=0)
+        with pytest.raises(ValueError):
+            UnsupervisedSampler(G=G, n_jobs=1.5)
+
+        def batches(n_jobs):
+            sampler = UnsupervisedSampler(G=G, length=3, seed=42, n_jobs=n_jobs)
+            sample_gen = sampler.generator(batch_size)
+            return [next(sample_gen) for _ in range(number_of_batches)]
+
+        # the samples depend on the seed but not on the number of worker processes
+        for (pairs_1, labels_1), (pairs_2, labels_2) in zip(batches(1), batches(2)):
+            assert pairs_1.tolist() == pairs_2.tolist()
+            assert labels_1.tolist() == labels_2.tolist()
+
+    def test_uniform_walks_csr(self):
+        # node 0 links to 1 and 2, node 1 links to 2, node 2 is a dead end
+        indptr = np.array([0, 2, 3, 3])
+        indices = np.array([1, 2, 2], dtype=np.int32)
+        starts = np.array([0, 0, 1, 2, 0], dtype=np.int32)
+
+        walks = _uniform_walks(indptr, indices, starts, length=4, seed=1)
+
+        assert walks.shape == (len(starts), 4)
+        assert walks[:, 0].tolist() == starts.tolist()
+
+        for walk in walks:
+            walk = walk[walk >= 0].tolist()
+            # each step follows an edge, and only a dead end stops a walk early
+            for source, target in zip(walk, walk[1:]):
+                assert target in indices[indptr[source] : indptr[source + 1]]
+            assert walk[-1] == 2
+
+        # the walks are reproducible for a given seed
+        assert (
+            _uniform_walks(indptr, indices, starts, length=4, seed=1).tolist()
+            == walks.tolist()
+        )
+
+    def test_graph_arrays(self):
+        G = example_graph_random(feature_size=None, n_nodes=20, n_isolates=2)
+        sampler = UnsupervisedSampler(G=G)
+
+        for i, node in enumerate(sampler._node_array):
+            neighbours = sampler._indices[sampler._indptr[i] : sampler._indptr[i + 1]]
+
+            # the CSR adjacency list has the neighbours of each node, sorted by index
+            assert sorted(sampler._node_array[j] for j in neighbours) == sorted(
+                G.neighbors(node)
+            )
+            assert neighbours.tolist() == sorted(neighbours.tolist())
+
+    @pytest.mark.parametrize("is_directed", [False, True])
+    def test_graph_degrees(self, is_directed):
+        # this graph has self loops and isolated nodes
+        G = StellarGraph(
+            create_test_graph_nx(is_directed=is_directed), is_directed=is_directed
+        )
+        sampler = UnsupervisedSampler(G=G)
+
+        degrees = G.node_degrees()
+        assert sampler._degrees.tolist() == [
+            degrees[node] for node in sampler._node_array
+        ]
+
+    def test_generator_walks_follow_edges(self):
+        G = example_graph_random(feature_size=None, n_nodes=20, n_isolates=2)
+        neighbours = {node: set(G.neighbors(node)) for node in G.nodes()}
+
+        sampler = UnsupervisedSampler(G=G, length=5, seed=3)
+        chunks = sampler._walks(chunk_size=7)
+
+        for _ in range(10):
+            walks = next(chunks)
+            assert walks.shape[1] == 5
+
+            for walk in walks:
+                walk = sampler._node_array[walk[walk >= 0]]
+                for source, target in zip(walk, walk[1:]):
+                    assert target in neighbours[source]
+
+    def test_alias_table(self):
+        weights = np.array([2, 0, 6, 1, 5, 0, 2])
+        n = len(weights)
+        total = weights.sum()
+
+        thresholds, aliases = _alias_table(weights)
+
+        # the chance of drawing each outcome is the chance of picking its own column and
+        # keeping it, plus the chance of picking a column that aliases to it and not keeping it
+        distribution = thresholds / total
+        np.add.at(distribution, aliases, 1 - thresholds / total)
+        distribution /= n
+
+        np.testing.assert_allclose(distribution, weights / total)
+
+        # outcomes with zero weight can never be drawn
+        assert all(thresholds[weights == 0] == 0)
+
+    def test_generator_tuple_nodes(self):
+        g = nx.Graph()
+        g.add_edges_from([((0, 0), (0, 1)), ((0, 1), (1, 1)), ((1, 1), (0, 0))])
+
+        sampler = UnsupervisedSampler(G=StellarGraph(g), length=3, seed=1)
+        pairs, labels = next(sampler.generator(batch_size=4))
+
+        # node IDs that are tuples are kept whole, not split into their elements
+        assert pairs.dtype == object
+        assert pairs.shape == (4, 2)
+        assert all(node in g for node in pairs.ravel())
+
+    def test_generator_prefetch(self):
+        batch_size = 4
+        number_of_batches = 10
+
+        G = example_graph_random(feature_size=None, n_nodes=20, n_isolates=2)
+
+        # the number of batches to prefetch must be a non-negative integer
+        with pytest.raises(ValueError):
+            UnsupervisedSampler(G=G, prefetch=-1)
+        with pytest.raises(ValueError):
+            UnsupervisedSampler(G=G, prefetch=1.5)
+
+        def batches(prefetch):
+            sampler = UnsupervisedSampler(G=G, length=3, seed=42, prefetch=prefetch)
+            sample_gen = sampler.generator(batch_size)
+            result = [next(sample_gen) for _ in range(number_of_batches)]
+            sample_gen.close()
+            return result
+
+        # the samples are the same whether or not they are generated in the background
+        for (pairs_1, labels_1), (pairs_2, labels_2) in zip(batches(0), batches(2)):
+            assert pairs_1.tolist() == pairs_2.tolist()
+            assert labels_1.tolist() == labels_2.tolist()
+
+        # closing the generator stops the background thread
+        sampler = UnsupervisedSampler(G=G, length=3, seed=42, prefetch=1)
+        threads_before = set(threading.enumerate())
+        sample_gen = sampler.generator(batch_size)
+        next(sample_gen)
+        prefetch_threads = set(threading.enumerate()) - threads_before
+        assert len(prefetch_threads) == 1
+
+        sample_gen.close()
+        for thread in prefetch_threads:
+            thread.join(timeout=5)
+            assert not thread.is_alive()
+
+    def test_prefetch_errors(self):
+        class Interrupted(BaseException):
+            pass
+
+        def items():
+            yield 1
+            raise Interrupted()
+
+        # an error in the background thread, even one that is not an Exception, is raised to
+        # the consumer rather than leaving it waiting for the next item
+        prefetched = _prefetch(items(), 1)
+        assert next(prefetched) == 1
+        with pytest.raises(Interrupted):
+            next(prefetched)
+
+        # the consumer sees the end of a finite iterator
+        assert list(_prefetch(iter(range(5)), 2)) == list(range(5))
+
+    def test_generator_large_integer_nodes(self):
+        # integer node IDs outside the int64 range, such as 64-bit hashes, are kept exactly
+        big = 2 ** 63
+        huge = np.uint64(2 ** 64 - 1)
+        g = nx.Graph()
+        g.add_edges_from([(big, big + 1), (big + 1, huge), (huge, 1)])
+
+        sampler = UnsupervisedSampler(G=StellarGraph(g), length=3, seed=1)
+        pairs, labels = next(sampler.generator(batch_size=4))
+
+        assert pairs.dtype == object
+        assert all(node in g for node in pairs.ravel())
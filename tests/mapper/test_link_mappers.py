@@ -376,6 +376,21 @@ class Test_GraphSAGELinkGenerator:
                 G, batch_size=n_batch, num_samples=n_samples
             ).flow()
 
+    def test_GraphSAGELinkGenerator_unsupervisedSampler_prefetch(self):
+
+        G = example_graph_2(feature_size=self.n_feat)
+
+        # the sequence uses the sampler's prefetching, and gives the same batches as without it
+        def batches(prefetch):
+            unsupervisedSamples = UnsupervisedSampler(G, seed=1, prefetch=prefetch)
+            gen = GraphSAGELinkGenerator(
+                G, batch_size=self.batch_size, num_samples=self.num_samples
+            )
+            mapper = gen.flow(unsupervisedSamples)
+            return [mapper[batch][1].tolist() for batch in range(len(mapper))]
+
+        assert batches(2) == batches(0)
+
     def test_GraphSAGELinkGenerator_unsupervisedSampler_sample_generation(self):
 
         G = example_graph_2(feature_size=self.n_feat)